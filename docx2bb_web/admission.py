@@ -0,0 +1,89 @@
+import math
+import time
+import threading
+
+
+class Admission:
+	"""Admission control for conversions: a global cap on concurrent conversions with a short
+	bounded first-come first-served wait queue, and per-client token-bucket rate limiting.
+	limits maps a client key kind (e.g. 'ip', 'id') to its (rate_per_minute, burst); each
+	client value gets its own bucket. Limits are kept in memory, so they apply per server process"""
+
+	def __init__(self, max_active=1, max_queued=8, queue_timeout=10, limits=None):
+		self.max_active = max_active
+		self.max_queued = max_queued
+		self.queue_timeout = queue_timeout
+		self.limits = {k:(rate/60.0, burst) for k,(rate,burst) in (limits or {}).items()}
+		self.active = 0
+		self.queue = []  # waiting requests, in arrival order
+		self.buckets = {}  # (kind, value): (tokens, last_update)
+		self.counts = {'admitted':0, 'queued':0, 'rejected_busy':0, 'rejected_rate':0}
+		self.lock = threading.Condition()
+
+	def acquire(self, client):
+		"""Try to start a conversion for client ({kind: value}). Returns 0 if admitted (call
+		release() when done), otherwise the number of seconds the client should wait. A rate
+		limit token is held while queued and refunded if the conversion is not admitted"""
+		with self.lock:
+			keys = [(k,v) for k,v in client.items() if k in self.limits]
+			wait = self.take_token(keys)
+			if wait > 0:
+				self.counts['rejected_rate'] += 1
+				return wait
+			if self.active < self.max_active and self.queue == []:
+				self.active += 1
+				self.counts['admitted'] += 1
+				return 0
+			if len(self.queue) >= self.max_queued:
+				self.refund_token(keys)
+				self.counts['rejected_busy'] += 1
+				return self.busy_retry_after()
+			ticket = object()
+			self.queue.append(ticket)
+			self.counts['queued'] += 1
+			admitted = self.lock.wait_for(lambda: self.queue[0] is ticket and self.active < self.max_active,
+										  self.queue_timeout)
+			self.queue.remove(ticket)
+			self.lock.notify_all()  # the next request in the queue may be admitted now
+			if not admitted:
+				self.refund_token(keys)
+				self.counts['rejected_busy'] += 1
+				return self.busy_retry_after()
+			self.active += 1
+			self.counts['admitted'] += 1
+			return 0
+
+	def busy_retry_after(self):
+		return max(1, int(math.ceil(self.queue_timeout)))
+
+	def release(self):
+		with self.lock:
+			self.active -= 1
+			self.lock.notify_all()
+
+	def tokens(self, key, now):
+		rate, burst = self.limits[key[0]]
+		t, last = self.buckets.get(key, (burst, now))
+		return min(burst, t + (now-last)*rate)
+
+	def take_token(self, keys):
+		"""Take one token from each key's bucket if all have one, otherwise return seconds until they do"""
+		now = time.monotonic()
+		if len(self.buckets) > 10000:  # forget idle clients, their buckets are full anyway
+			self.buckets = {k:v for k,v in self.buckets.items() if self.tokens(k, now) < self.limits[k[0]][1]}
+		tokens = {k:self.tokens(k, now) for k in keys}
+		wait = [(1-t) / self.limits[k[0]][0] for k,t in tokens.items() if t < 1]
+		if wait != []:
+			return max(1, int(math.ceil(max(wait))))
+		for k,t in tokens.items():
+			self.buckets[k] = (t-1, now)
+		return 0
+
+	def refund_token(self, keys):
+		now = time.monotonic()
+		for k in keys:
+			self.buckets[k] = (min(self.limits[k[0]][1], self.tokens(k, now)+1), now)
+
+	def stats(self):
+		with self.lock:
+			return dict(self.counts, active=self.active, waiting=len(self.queue))
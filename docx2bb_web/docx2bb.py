@@ -5,6 +5,7 @@ Create BlackBoard (bb) test questions (text) import file from a Microsoft Word *
 Supported question types are: True/False, Multiple choice, Matching, Essay, and (simple) Fill
 in the blank. ExamFormat-Sample.docx shows a sample exam format for use with docx2bb.
 Unicode-to-ASCII replacement rules from 'docx2bb.json' data file can be optionally applied.
+QTI 2.1 (*.zip) and Moodle GIFT (*.gift.txt) files can be created in the same run.
 
 Syntax:
 	docx2bb [options] [docx_filename]
@@ -12,6 +13,8 @@ or
 	python docx2bb.py [options] [docx_filename]
 options:
 	--verbose  | -v  display verbose messages
+	--qti      | -q  also create QTI 2.1 content package (*.zip)
+	--gift     | -g  also create Moodle GIFT file (*.gift.txt)
 	--help     | -h display help message
 
 Disclaimer:
@@ -22,6 +25,8 @@ this tool, including if it eats your exam ;).
 
 HELP_MSG = """Options:
 	--verbose | -v  display verbose messages
+	--qti     | -q  also create QTI 2.1 content package (*.zip)
+	--gift    | -g  also create Moodle GIFT file (*.gift.txt)
 	--help    | -h  display help message
 """
 
@@ -52,6 +57,7 @@ import docx2bb_lib as d2b
 
 # Initialization ###############################################################
 verbose = False
+formats = []
 WordFileName = ""
 
 
@@ -59,6 +65,7 @@ WordFileName = ""
 def ProcessCLI():
 	"""Process CLI parameters"""
 	global verbose
+	global formats
 	global WordFileName
 
 	# Get terminal width
@@ -78,6 +85,12 @@ def ProcessCLI():
 	if '--verbose' in sys.argv or '-v' in sys.argv:
 		print("*** Option: verbose mode")
 		verbose = True
+	if '--qti' in sys.argv or '-q' in sys.argv:
+		print("*** Option: QTI 2.1 output")
+		formats.append('qti')
+	if '--gift' in sys.argv or '-g' in sys.argv:
+		print("*** Option: GIFT output")
+		formats.append('gift')
 	if '--help' in sys.argv or '-h' in sys.argv:
 		print("Syntax:\n\tdocx2bb [options] [docx_filename]\n\tpython docx2bb.py [options] [docx_filename]")
 		print(HELP_MSG)
@@ -85,6 +98,7 @@ def ProcessCLI():
 	WordFileName = sys.argv[-1]
 	if not os.path.isfile(WordFileName):
 		print("Error - can't find file: {:}. Make sure [docx_filename] is the last argument.".format(WordFileName))
+		sys.exit(0)
 
 
 # Analyze Document and Convert to BB Text Format ###############################
@@ -99,13 +113,33 @@ def RunScript():
 		print(INSTALL_MSG)
 		sys.exit(0)
 
+	# output file names, never overwrite the input file
+	basename = os.path.splitext(WordFileName)[0]
+	OutputFileNames = {'bb':basename + '.txt', 'qti':basename + '.zip', 'gift':basename + '.gift.txt'}
+	for f in OutputFileNames.values():
+		if os.path.abspath(f) == os.path.abspath(WordFileName):
+			print("Error - output file {:} would overwrite the input file.".format(f))
+			sys.exit(0)
+
 	# open docx file
 	if verbose:
 		print('Reading Docx file...\n')
-	output = d2b.Convert(docx.Document(WordFileName),'activity_cli.log')
+	document = docx.Document(WordFileName)
+
+	# convert, writing QTI and GIFT files while parsing
+	outputs = []
+	try:
+		if 'qti' in formats:
+			outputs.append(d2b.emitters.QTIEmitter(open(OutputFileNames['qti'],'wb')))
+		if 'gift' in formats:
+			outputs.append(d2b.emitters.GIFTEmitter(open(OutputFileNames['gift'],'w',encoding='utf8')))
+		output = d2b.Convert(document,'activity_cli.log',outputs=outputs)
+	finally:
+		for e in outputs:
+			e.stream.close()
 
 	# write to Blackboard text file
-	with open(WordFileName.replace('.docx','.txt'),'w') as outputfile:
+	with open(OutputFileNames['bb'],'w') as outputfile:
 		outputfile.write(output['result'].strip('\n'))
 
 	if verbose:
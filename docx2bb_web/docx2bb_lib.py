@@ -5,6 +5,8 @@ Create BlackBoard (bb) test questions (text) import file from a Microsoft Word *
 Supported question types are: True/False, Multiple choice, Matching, Essay, and (simple) Fill
 in the blank. ExamFormat-Sample.docx shows a sample exam format for use with docx2bb.
 Unicode-to-ASCII replacement rules from 'docx2bb.json' data file can be optionally applied.
+Classified questions are passed to emitters (see emitters.py), so BlackBoard text, QTI 2.1 and
+Moodle GIFT outputs can all be produced from a single pass over the document.
 
 Licensed under GPLv3
 Code by Sinan Salman, 2016-2017
@@ -16,8 +18,10 @@ import os
 import sys
 try:
 	import docx2bb_web.mylog as mylog
+	import docx2bb_web.emitters as emitters
 except:
 	import mylog
+	import emitters
 import json
 
 ### Initialization #######################################################################
@@ -30,25 +34,34 @@ log = mylog.LOG()
 unicode2ascii = {'rules':{'“':'"','”':'"','‘':"'",'’':"'",'–':'-','…':'...','\t':'   '},
 				 'notallowed':'[^a-zA-Z0-9 §±!@#$%^&*()\\-_=+[\\]{};:\'\"\\\\|<>,./?`~\\n]'}
 data = []
-BBtext = ""
 QuestionTypes = {'T/F':0, 'M/C':0,'MAT':0,'FIB':0,'ESSAY':0,'Warning':0}
 
 ### Analyze Document and Convert to BB Text Format #######################################
-def Convert(docx, logfilename='', id=0, ip='0.0.0.0'):
+def Convert(docx, logfilename='', id=0, ip='0.0.0.0', outputs=None):
+	"""Convert docx, passing each question to outputs (list of emitters). An in-memory
+	BlackBoard text emitter is always added and its text is returned as 'result'"""
+	bb = emitters.BBEmitter()
+	outputs = [bb] + list(outputs or [])
 	log.clear('all')
 	log.debug('Session ID: {:} ({:})'.format(id,ip))
+	log.debug('Output format(s): {:}'.format(', '.join(e.name for e in outputs)))
+	for e in outputs:
+		e.begin()
 	try:
-		ProcessDocx(docx)
+		ProcessDocx(docx, outputs)
 	except ImportError as e:
 		log.info('ERROR - ' + e)
+	finally:
+		for e in outputs:
+			e.end()
 	log.save('debug',logfilename)
-	return {'result': BBtext,
+	return {'result': bb.getvalue(),
 			'info': log.logtext['info'],
 			'debug': log.logtext['debug'],
 			'summary': QuestionTypes}
 
-def ProcessDocx(docx):
-	"""Process docx contents and create BB text import file"""
+def ProcessDocx(docx, outputs):
+	"""Process docx contents and pass identified questions to outputs"""
 	if os.path.isfile('docx2bb.json'):
 		if sys.version_info[0] == 2:
 			jsonfile = open('docx2bb.json')
@@ -147,7 +160,7 @@ def ProcessDocx(docx):
 	# convert to Blackboard import file format
 	log.debug('Found {:} possible question(s), identifying type...'.format(len(Qbeg_pos)))
 	for i in range(len(Qbeg_pos)):
-		make_Q(i, Qbeg_pos[i], Qend_pos[i])
+		make_Q(i, Qbeg_pos[i], Qend_pos[i], outputs)
 
 	# prep summary
 	log.info('Summary:')
@@ -184,10 +197,9 @@ def GetListOutline(p):
 					lvl = 1
 	return lst, lvl
 
-def make_Q(Qid, start, end):
-	"""Convert data to Blackboard import file format"""
+def make_Q(Qid, start, end, outputs):
+	"""Identify question type and pass it to outputs (emitters)"""
 
-	global BBtext
 	global QuestionTypes
 
 	Qid += 1
@@ -209,12 +221,12 @@ def make_Q(Qid, start, end):
 			QuestionTypes['Warning'] += 1
 		elif data[start]['trueBold']:
 			Qtxt = re.sub('\([ ]*True[ ]*/[ ]*False[ ]*\)','',data[start]['text'],flags=re.IGNORECASE).strip(' ')
-			BBtext += "\nTF\t{:}\ttrue".format(Qtxt)
+			emit(outputs, Qid, 'TF', Qtxt, answers=[('true',True)])
 			log.debug('\tQ{:} identified as True/False'.format(Qid))
 			QuestionTypes['T/F'] += 1
 		elif data[start]['falseBold']:
 			Qtxt = re.sub('\([ ]*True[ ]*/[ ]*False[ ]*\)','',data[start]['text'],flags=re.IGNORECASE).strip(' ')
-			BBtext += "\nTF\t{:}\tfalse".format(Qtxt)
+			emit(outputs, Qid, 'TF', Qtxt, answers=[('false',True)])
 			log.debug('\tQ{:} identified as True/False'.format(Qid))
 			QuestionTypes['T/F'] += 1
 		else:
@@ -225,27 +237,23 @@ def make_Q(Qid, start, end):
 
 	# Fill In the Blank question
 	if BoldCount == 0 and re.search('_{5,}',data[start]['text']) != None:
-		BBtext += "\nFIB\t{:}".format(data[start]['text'])
-		for i in range(start+1,end+1): # range does not include the end value, so +1 is needed
-			BBtext += "\t{:}".format(data[i]['text'])
+		answers = [(data[i]['text'],True) for i in range(start+1,end+1)] # range does not include the end value, so +1 is needed
+		emit(outputs, Qid, 'FIB', data[start]['text'], answers=answers)
 		log.debug('\tQ{:} identified as Fill_In_the_Blank'.format(Qid))
 		QuestionTypes['FIB'] += 1
 		return
 
 	# Essay question
 	if BoldCount == 0 and start+1 == end:
-			BBtext += "\nESS\t{:}\t{:}".format(data[start]['text'],data[end]['text'])
+			emit(outputs, Qid, 'ESS', data[start]['text'], answers=[(data[end]['text'],True)])
 			log.debug('\tQ{:} identified as Essay'.format(Qid))
 			QuestionTypes['ESSAY'] += 1
 			return
 
 	# M/C question
 	if BoldCount == 1:
-		BBtext += "\nMC\t{:}".format(data[start]['text'])
-		for i in range(start+1,end+1): # range does not include the end value, so +1 is needed
-			if data[i]['allBold']: 	answer = 'correct'
-			else: 					answer = 'incorrect'
-			BBtext += "\t{:}\t{:}".format(data[i]['text'],answer)
+		answers = [(data[i]['text'],data[i]['allBold']) for i in range(start+1,end+1)] # range does not include the end value, so +1 is needed
+		emit(outputs, Qid, 'MC', data[start]['text'], answers=answers)
 		log.debug('\tQ{:} identified as Multiple Choice'.format(Qid))
 		QuestionTypes['M/C'] += 1
 		return
@@ -254,10 +262,11 @@ def make_Q(Qid, start, end):
 	n=0
 	if BoldCount == 0 and MAT_start != 0:
 		if (end - start)%2 == 0 and MAT_start - start - 1 == end - MAT_start +1 : # equal number of sentences and terms
-			BBtext += "\nMAT\t{:}".format(data[start]['text'])
+			pairs = []
 			for i in range(start+1,MAT_start):
-				BBtext += "\t{:}\t{:}".format(data[start+1+n]['text'],data[MAT_start+n]['text'])
+				pairs.append((data[start+1+n]['text'],data[MAT_start+n]['text']))
 				n += 1
+			emit(outputs, Qid, 'MAT', data[start]['text'], pairs=pairs)
 			log.debug('\tQ{:} identified as Matching'.format(Qid))
 			QuestionTypes['MAT'] += 1
 		else:
@@ -271,6 +280,14 @@ def make_Q(Qid, start, end):
 	log.info("\t{:}".format(data[start]['text']))
 	QuestionTypes['Warning'] += 1
 
+def emit(outputs, Qid, type, text, answers=None, pairs=None):
+	"""Pass a classified question to all outputs"""
+	if answers is None: answers = []
+	if pairs is None: 	pairs = []
+	Q = {'Qid':Qid, 'type':type, 'text':text, 'answers':answers, 'pairs':pairs}
+	for e in outputs:
+		e.question(Q)
+
 def u2a(txt):
 	"""Convert unicode text to ascii"""
 
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+emitters:
+Output formats for docx2bb. make_Q (docx2bb_lib) classifies each question once and hands
+the result to every emitter in turn, so one pass over the document can produce several
+import files. A question is passed as a dict:
+	{'Qid': 3, 'type': 'MC', 'text': 'stem', 'answers': [('answer', True), ...], 'pairs': [('sentence', 'term'), ...]}
+'type' is one of TF, MC, MAT, FIB, ESS. For TF 'answers' holds a single ('true'|'false', True)
+entry, for FIB all acceptable answers and for ESS the example answer.
+
+Supported emitters are:
+	BBEmitter   - BlackBoard tab-delimited text
+	GIFTEmitter - Moodle GIFT text
+	QTIEmitter  - IMS QTI 2.1 content package (zip of item files and imsmanifest.xml)
+
+Licensed under GPLv3
+Code by Sinan Salman, 2016-2019
+sinan[dot]salman[at]gmail[dot]com
+"""
+
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+
+class Emitter:
+	"""Base class for output formats, writes to stream (an in-memory buffer if not given)"""
+	name = ''
+
+	def __init__(self, stream=None):
+		self.stream = stream if stream is not None else self.new_buffer()
+
+	def new_buffer(self):
+		return io.StringIO()
+
+	def begin(self):
+		pass
+
+	def question(self, Q):
+		raise NotImplementedError
+
+	def end(self):
+		pass
+
+	def getvalue(self):
+		"""return output written so far, if stream is an in-memory buffer"""
+		if hasattr(self.stream, 'getvalue'):
+			return self.stream.getvalue()
+		return None
+
+
+class BBEmitter(Emitter):
+	"""BlackBoard tab-delimited text import format"""
+	name = 'bb'
+
+	def question(self, Q):
+		if Q['type'] == 'TF':
+			self.stream.write("\nTF\t{:}\t{:}".format(Q['text'], Q['answers'][0][0]))
+		elif Q['type'] == 'FIB':
+			self.stream.write("\nFIB\t{:}".format(Q['text']))
+			for a, correct in Q['answers']:
+				self.stream.write("\t{:}".format(a))
+		elif Q['type'] == 'ESS':
+			self.stream.write("\nESS\t{:}\t{:}".format(Q['text'], Q['answers'][0][0]))
+		elif Q['type'] == 'MC':
+			self.stream.write("\nMC\t{:}".format(Q['text']))
+			for a, correct in Q['answers']:
+				self.stream.write("\t{:}\t{:}".format(a, 'correct' if correct else 'incorrect'))
+		elif Q['type'] == 'MAT':
+			self.stream.write("\nMAT\t{:}".format(Q['text']))
+			for s, t in Q['pairs']:
+				self.stream.write("\t{:}\t{:}".format(s, t))
+
+
+class GIFTEmitter(Emitter):
+	"""Moodle GIFT text import format"""
+	name = 'gift'
+
+	def question(self, Q):
+		title = '::Q{:}::'.format(Q['Qid'])
+		if Q['type'] == 'TF':
+			self.write(title + gift(Q['text']) + ' {' + ('T' if Q['answers'][0][0] == 'true' else 'F') + '}')
+		elif Q['type'] == 'FIB':
+			answers = ' {' + ' '.join('=' + gift(a) for a, correct in Q['answers']) + '} '
+			parts = re.split('_{5,}', Q['text'], maxsplit=1)
+			if len(parts) == 2:
+				self.write(title + gift(parts[0]).rstrip(' ') + answers + gift(parts[1]).lstrip(' '))
+			else:
+				self.write(title + gift(Q['text']) + answers.rstrip(' '))
+		elif Q['type'] == 'ESS':
+			self.write(title + gift(Q['text']) + ' {####' + gift(Q['answers'][0][0]) + '}')
+		elif Q['type'] == 'MC':
+			answers = ['\t{:}{:}'.format('=' if correct else '~', gift(a)) for a, correct in Q['answers']]
+			self.write(title + gift(Q['text']) + ' {\n' + '\n'.join(answers) + '\n}')
+		elif Q['type'] == 'MAT':
+			# Moodle splits a pair at its first '->' and reads the sentence as html, so a '->' in
+			# the sentence is written as '-&gt;'; the term may contain '->' as is
+			pairs = ['\t={:} -> {:}'.format(gift(s).replace('->', '-&gt;'), gift(t)) for s, t in Q['pairs']]
+			self.write(title + gift(Q['text']) + ' {\n' + '\n'.join(pairs) + '\n}')
+
+	def write(self, txt):
+		self.stream.write(txt + '\n\n')
+
+
+class QTIEmitter(Emitter):
+	"""IMS QTI 2.1 content package, each question is written to the zip as soon as it is classified"""
+	name = 'qti'
+
+	def new_buffer(self):
+		return io.BytesIO()
+
+	def begin(self):
+		self.zip = zipfile.ZipFile(self.stream, 'w', zipfile.ZIP_DEFLATED)
+		self.items = []
+
+	def question(self, Q):
+		ident = 'Q{:}'.format(Q['Qid'])
+		body, response, processing = getattr(self, 'item_' + Q['type'])(Q)
+		item = QTI_ITEM.format(ident=quoteattr(ident), title=quoteattr(Q['text'][:60]),
+							   response=response, body=body, processing=processing)
+		self.zip.writestr(ident + '.xml', item)
+		self.items.append(ident)
+
+	def end(self):
+		resources = ''.join(QTI_RESOURCE.format(ident=i) for i in self.items)
+		self.zip.writestr('imsmanifest.xml', QTI_MANIFEST.format(resources=resources))
+		self.zip.close()
+
+	def item_TF(self, Q):
+		Q = dict(Q, answers=[('True', Q['answers'][0][0] == 'true'), ('False', Q['answers'][0][0] == 'false')])
+		return self.item_MC(Q)
+
+	def item_MC(self, Q):
+		choices = ''.join('\n\t\t\t<simpleChoice identifier="A{:}">{:}</simpleChoice>'.format(n, escape(a))
+						  for n, (a, correct) in enumerate(Q['answers'], 1))
+		body = ('<choiceInteraction responseIdentifier="RESPONSE" shuffle="false" maxChoices="1">'
+				'\n\t\t\t<prompt>{:}</prompt>{:}\n\t\t</choiceInteraction>').format(escape(Q['text']), choices)
+		correct = ''.join('<value>A{:}</value>'.format(n) for n, (a, c) in enumerate(Q['answers'], 1) if c)
+		response = QTI_RESPONSE.format(cardinality='single', baseType='identifier', values=correct, mapping='')
+		return body, response, QTI_MATCH_CORRECT
+
+	def item_MAT(self, Q):
+		sentences = ''.join('\n\t\t\t\t<simpleAssociableChoice identifier="S{:}" matchMax="1">{:}</simpleAssociableChoice>'
+							.format(n, escape(s)) for n, (s, t) in enumerate(Q['pairs'], 1))
+		terms = ''.join('\n\t\t\t\t<simpleAssociableChoice identifier="T{:}" matchMax="1">{:}</simpleAssociableChoice>'
+						.format(n, escape(t)) for n, (s, t) in enumerate(Q['pairs'], 1))
+		body = ('<matchInteraction responseIdentifier="RESPONSE" shuffle="true" maxAssociations="{:}">'
+				'\n\t\t\t<prompt>{:}</prompt>'
+				'\n\t\t\t<simpleMatchSet>{:}\n\t\t\t</simpleMatchSet>'
+				'\n\t\t\t<simpleMatchSet>{:}\n\t\t\t</simpleMatchSet>'
+				'\n\t\t</matchInteraction>').format(len(Q['pairs']), escape(Q['text']), sentences, terms)
+		correct = ''.join('<value>S{0:} T{0:}</value>'.format(n) for n in range(1, len(Q['pairs'])+1))
+		response = QTI_RESPONSE.format(cardinality='multiple', baseType='directedPair', values=correct, mapping='')
+		return body, response, QTI_MATCH_CORRECT
+
+	def item_FIB(self, Q):
+		interaction = '<textEntryInteraction responseIdentifier="RESPONSE" expectedLength="15"/>'
+		parts = re.split('_{5,}', Q['text'], maxsplit=1)
+		if len(parts) == 2:
+			body = '<p>{:}{:}{:}</p>'.format(escape(parts[0]), interaction, escape(parts[1]))
+		else:
+			body = '<p>{:} {:}</p>'.format(escape(Q['text']), interaction)
+		mapping = ''.join('<mapEntry mapKey={:} mappedValue="1" caseSensitive="false"/>'.format(quoteattr(a))
+						  for a, correct in Q['answers'])
+		response = QTI_RESPONSE.format(cardinality='single', baseType='string',
+									   values='<value>{:}</value>'.format(escape(Q['answers'][0][0])),
+									   mapping='\n\t\t<mapping defaultValue="0">{:}</mapping>'.format(mapping))
+		return body, response, QTI_MAP_RESPONSE
+
+	def item_ESS(self, Q):
+		body = ('<extendedTextInteraction responseIdentifier="RESPONSE">'
+				'\n\t\t\t<prompt>{:}</prompt>\n\t\t</extendedTextInteraction>').format(escape(Q['text']))
+		response = '<responseDeclaration identifier="RESPONSE" cardinality="single" baseType="string"/>'
+		return body, response, ''
+
+
+def gift(txt):
+	"""Escape GIFT control characters"""
+	return re.sub(r'([~=#{}:\\])', r'\\\1', txt)
+
+
+### QTI 2.1 templates ####################################################################
+QTI_ITEM = """<?xml version="1.0" encoding="UTF-8"?>
+<assessmentItem xmlns="http://www.imsglobal.org/xsd/imsqti_v2p1"
+	xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+	xsi:schemaLocation="http://www.imsglobal.org/xsd/imsqti_v2p1 http://www.imsglobal.org/xsd/qti/qtiv2p1/imsqti_v2p1.xsd"
+	identifier={ident} title={title} adaptive="false" timeDependent="false">
+	{response}
+	<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float"/>
+	<itemBody>
+		{body}
+	</itemBody>
+	{processing}
+</assessmentItem>
+"""
+
+QTI_RESPONSE = """<responseDeclaration identifier="RESPONSE" cardinality="{cardinality}" baseType="{baseType}">
+		<correctResponse>{values}</correctResponse>{mapping}
+	</responseDeclaration>"""
+
+QTI_MATCH_CORRECT = '<responseProcessing template="http://www.imsglobal.org/question/qti_v2p1/rptemplates/match_correct"/>'
+
+QTI_MAP_RESPONSE = '<responseProcessing template="http://www.imsglobal.org/question/qti_v2p1/rptemplates/map_response"/>'
+
+QTI_MANIFEST = """<?xml version="1.0" encoding="UTF-8"?>
+<manifest xmlns="http://www.imsglobal.org/xsd/imscp_v1p1" identifier="docx2bb_manifest">
+	<organizations/>
+	<resources>{resources}
+	</resources>
+</manifest>
+"""
+
+QTI_RESOURCE = """
+		<resource identifier="{ident}" type="imsqti_item_xmlv2p1" href="{ident}.xml">
+			<file href="{ident}.xml"/>
+		</resource>"""
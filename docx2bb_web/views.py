@@ -7,6 +7,7 @@ import pickle
 import docx
 from docx2bb_web import app
 import docx2bb_web.docx2bb_lib as d2b
+from docx2bb_web.admission import Admission
 from flask import request, session, redirect, url_for, render_template, flash, Response
 
 # flask setup
@@ -20,6 +21,10 @@ app.config.from_envvar('docx2bb_SETTINGS', silent=True)
 app.secret_key = 'change to a random value and keep this really secret'  # set the secret key for 'session'
 NextID = 1000
 ALLOWED_EXTENSIONS = set(['docx'])
+MAX_CONVERSIONS = 1  # docx2bb_lib keeps its parse state in module globals, conversions must not overlap
+admission = Admission(max_active=MAX_CONVERSIONS, max_queued=app.config['MAX_QUEUED'], queue_timeout=app.config['QUEUE_TIMEOUT'],
+					  limits={'ip':(app.config['RATE_PER_MINUTE_IP'], app.config['RATE_BURST_IP']),
+							  'id':(app.config['RATE_PER_MINUTE_SESSION'], app.config['RATE_BURST_SESSION'])})
 
 
 ################################################################################
@@ -146,7 +151,7 @@ def admin_server():
 			log = f.read()
 	else:
 		log = ''
-	return render_template('admin_server.html',log=log)
+	return render_template('admin_server.html',log=log,admission=admission.stats())
 
 
 @app.route('/start_new_log', methods=['GET'])
@@ -167,6 +172,20 @@ def start_new_log():
 
 @app.route('/load_docx', methods=['POST'])
 def load_docx():
+	if 'ID' not in session:
+		flash('Session expired, please select the file again.')
+		return redirect(url_for('index'))
+	retry_after = admission.acquire({'ip':request.remote_addr, 'id':session['ID']})
+	if retry_after:
+		flash('Too many conversion requests, please try again in {:} seconds.'.format(retry_after))
+		return render_template('index.html',output=session.get('output',{})), 429, {'Retry-After':str(retry_after)}
+	try:
+		return convert_docx()
+	finally:
+		admission.release()
+
+
+def convert_docx():
 	if 'filename' not in request.files:
 		flash('No file part in posted request.')
 		return redirect(url_for('index'))
@@ -0,0 +1,11 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, 'docx2bb_web')
+
+# import the library modules the same way the docx2bb cli does: from docx2bb_web/ with the
+# repo root off sys.path, so docx2bb_lib uses the top-level mylog/emitters and not the web app
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != ROOT]
+sys.path.insert(0, WEB)
+import docx2bb_lib
@@ -0,0 +1,81 @@
+import threading
+import time
+from admission import Admission
+
+
+def test_concurrency_cap_and_queue_timeout():
+	a = Admission(max_active=1, max_queued=1, queue_timeout=0.2)
+	assert a.acquire({}) == 0
+	start = time.monotonic()
+	assert a.acquire({}) == 1  # queued, then timed out
+	assert time.monotonic() - start >= 0.2
+	assert a.stats() == {'admitted':1, 'queued':1, 'rejected_busy':1, 'rejected_rate':0, 'active':1, 'waiting':0}
+
+
+def test_queued_request_admitted_on_release():
+	a = Admission(max_active=1, max_queued=1, queue_timeout=2)
+	assert a.acquire({}) == 0
+	threading.Timer(0.1, a.release).start()
+	assert a.acquire({}) == 0
+	assert a.stats()['queued'] == 1 and a.stats()['admitted'] == 2
+
+
+def test_full_queue_rejects_without_waiting():
+	a = Admission(max_active=1, max_queued=0, queue_timeout=5)
+	assert a.acquire({}) == 0
+	start = time.monotonic()
+	assert a.acquire({}) == 5
+	assert time.monotonic() - start < 1
+
+
+def test_rate_limit_and_refill():
+	a = Admission(limits={'id':(60, 2)})  # one token per second
+	assert a.acquire({'id':1}) == 0
+	a.release()
+	assert a.acquire({'id':1}) == 0
+	a.release()
+	assert a.acquire({'id':1}) == 1
+	assert a.acquire({'id':2}) == 0  # other clients have their own bucket
+	a.release()
+	a.buckets[('id', 1)] = (0, time.monotonic() - 1)  # one second later
+	assert a.acquire({'id':1}) == 0
+	assert a.stats()['rejected_rate'] == 1
+
+
+def test_limits_per_kind():
+	a = Admission(max_active=10, limits={'ip':(60, 5), 'id':(60, 1)})
+	assert a.acquire({'ip':'10.0.0.1', 'id':1}) == 0
+	assert a.acquire({'ip':'10.0.0.1', 'id':1}) > 0  # session limit
+	assert a.acquire({'ip':'10.0.0.1', 'id':2}) == 0  # same NAT, another session
+
+
+def test_busy_rejection_refunds_token():
+	a = Admission(max_active=1, max_queued=0, limits={'id':(1, 1)})
+	assert a.acquire({'id':1}) == 0
+	assert a.acquire({'id':2}) > 0
+	assert a.stats()['rejected_busy'] == 1
+	a.release()
+	assert a.acquire({'id':2}) == 0
+
+
+def test_queue_is_first_come_first_served():
+	a = Admission(max_active=1, max_queued=2, queue_timeout=2)
+	order = []
+
+	def convert(name):
+		assert a.acquire({}) == 0
+		order.append(name)
+		a.release()
+
+	assert a.acquire({}) == 0
+	first = threading.Thread(target=convert, args=('queued',))
+	first.start()
+	while a.stats()['waiting'] == 0:
+		time.sleep(0.01)
+	later = threading.Thread(target=convert, args=('later',))
+	with a.lock:  # the later request arrives before the queued one gets the lock back
+		a.release()
+		later.start()
+	first.join()
+	later.join()
+	assert order == ['queued', 'later']
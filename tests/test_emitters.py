@@ -0,0 +1,98 @@
+import io
+import os
+import sys
+import zipfile
+import xml.dom.minidom
+import pytest
+docx = pytest.importorskip('docx')
+import docx2bb_lib as d2b
+import emitters
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docx2bb_web', 'static')
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def convert(name, outputs=None):
+	# docx2bb_lib keeps its parse state in module globals, start each conversion fresh
+	del d2b.data[:]
+	for k in d2b.QuestionTypes:
+		d2b.QuestionTypes[k] = 0
+	return d2b.Convert(docx.Document(os.path.join(STATIC, name + '.docx')), outputs=outputs)
+
+
+@pytest.mark.parametrize('name', ['ExamFormat-Sample', 'ExamFormat-test'])
+def test_bb_output_unchanged(name):
+	"""BB text must match the output of the pre-emitter BBtext code (saved in tests/data)"""
+	with open(os.path.join(DATA, name + '.txt'), encoding='utf8', newline='') as f:
+		expected = f.read()
+	assert convert(name)['result'] == expected
+
+
+@pytest.mark.parametrize('name', ['ExamFormat-Sample', 'ExamFormat-test'])
+def test_qti_items_parse(name):
+	qti = emitters.QTIEmitter()
+	output = convert(name, outputs=[qti])
+	package = zipfile.ZipFile(io.BytesIO(qti.getvalue()))
+	items = [n for n in package.namelist() if n != 'imsmanifest.xml']
+	assert len(items) == output['result'].count('\n')
+	for n in package.namelist():
+		xml.dom.minidom.parseString(package.read(n))
+
+
+def test_qti_answers():
+	qti = emitters.QTIEmitter()
+	convert('ExamFormat-Sample', outputs=[qti])
+	package = zipfile.ZipFile(io.BytesIO(qti.getvalue()))
+
+	def item(n):
+		return xml.dom.minidom.parseString(package.read('Q{:}.xml'.format(n)))
+
+	def correct(n):
+		return [v.firstChild.data for v in item(n).getElementsByTagName('value')]
+
+	def interaction(n):
+		return [e.tagName for e in item(n).getElementsByTagName('itemBody')[0].getElementsByTagName('*')
+				if e.tagName.endswith('Interaction')]
+
+	assert correct(1) == ['A1'] and interaction(1) == ['choiceInteraction']  # true
+	assert correct(2) == ['A2'] and interaction(2) == ['choiceInteraction']  # false
+	assert interaction(3) == ['textEntryInteraction']
+	assert [e.getAttribute('mapKey') for e in item(3).getElementsByTagName('mapEntry')] == ['water', 'H2O']
+	assert correct(4) == ['A3'] and interaction(4) == ['choiceInteraction']
+	choices = [c.firstChild.data for c in item(4).getElementsByTagName('simpleChoice')]
+	assert choices[2] == 'Kangaroos'
+	assert correct(5) == ['S1 T1', 'S2 T2', 'S3 T3', 'S4 T4'] and interaction(5) == ['matchInteraction']
+	sets = item(5).getElementsByTagName('simpleMatchSet')
+	assert sets[0].getElementsByTagName('simpleAssociableChoice')[1].firstChild.data == 'firm and stable in shape; not fluid.'
+	assert sets[1].getElementsByTagName('simpleAssociableChoice')[1].firstChild.data == 'Solid'
+	assert interaction(6) == ['extendedTextInteraction']
+
+
+def test_gift_output():
+	gift = emitters.GIFTEmitter()
+	convert('ExamFormat-Sample', outputs=[gift])
+	questions = gift.getvalue().strip('\n').split('\n\n')
+	assert len(questions) == 6
+	assert questions[0] == '::Q1::Humans need food and water to survive. {T}'
+	assert questions[2] == '::Q3::To stay healthy one must drink 8 cups of {=water =H2O} every day.'
+	assert questions[3] == '::Q4::Which one of the following animals hops on two legs? {\n\t~cats\n\t~dogs\n\t=Kangaroos\n\t~Eagles\n}'
+	assert questions[4].startswith('::Q5::Match the following statements with the corresponding correct definition or term\\: {\n')
+	assert questions[4].split('\n')[1:3] == ['\t=Sky color -> Blue', '\t=firm and stable in shape; not fluid. -> Solid']
+	assert questions[4].endswith(' -> Gas\n}')
+	assert questions[5] == '::Q6::Discuss the different types of computer operating systems. {####There are many types of computer operating systems such as . . .}'
+
+
+def test_gift_matching_arrow():
+	gift = emitters.GIFTEmitter()
+	gift.question({'Qid':1, 'type':'MAT', 'text':'Match', 'answers':[], 'pairs':[('a -> b', 'c -> d')]})
+	assert gift.getvalue() == '::Q1::Match {\n\t=a -&gt; b -> c -> d\n}\n\n'
+
+
+def test_gift_escape():
+	assert emitters.gift('a = b: {c} ~d #e') == 'a \\= b\\: \\{c\\} \\~d \\#e'
+
+
+def test_cli_import_path():
+	"""tests use the same modules as the cli, not the web app package"""
+	assert d2b.emitters is emitters
+	assert d2b.mylog is sys.modules['mylog']
@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import pytest
+pytest.importorskip('flask')
+from admission import Admission
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB = os.path.join(ROOT, 'docx2bb_web')
+
+
+@pytest.fixture
+def views(tmp_path, monkeypatch):
+	monkeypatch.chdir(ROOT)  # views.py loads ./docx2bb_web/config.json
+	if ROOT not in sys.path:
+		sys.path.append(ROOT)
+	import docx2bb_web.views as views
+	views.app.config.update(TESTING=True, LOGFILE=str(tmp_path / 'web_activity.log'),
+							STATEFILE=str(tmp_path / 'statefile.dat'))
+	monkeypatch.setattr(views, 'admission', Admission(max_active=1, max_queued=0, limits={'id':(6, 1)}))
+	return views
+
+
+@pytest.fixture
+def client(views):
+	client = views.app.test_client()
+	client.get('/')  # assigns session ID
+	return client
+
+
+def upload(client):
+	with open(os.path.join(WEB, 'static', 'ExamFormat-Sample.docx'), 'rb') as f:
+		data = f.read()
+	return client.post('/load_docx', data={'filename':(io.BytesIO(data), 'Exam.docx')})
+
+
+def test_load_docx(views, client):
+	r = upload(client)
+	assert r.status_code == 302
+	with client.session_transaction() as session:
+		assert session['output']['result'].startswith('\nTF\tHumans need food and water to survive.\ttrue')
+	assert views.admission.stats()['admitted'] == 1 and views.admission.stats()['active'] == 0
+
+
+def test_rate_limited(views, client):
+	assert upload(client).status_code == 302
+	r = upload(client)
+	assert r.status_code == 429
+	assert r.headers['Retry-After'] == '10'
+	assert b'Too many conversion requests, please try again in 10 seconds.' in r.data
+	assert views.admission.stats()['rejected_rate'] == 1
+
+
+def test_no_session(views):
+	r = upload(views.app.test_client())
+	assert r.status_code == 302 and r.headers['Location'].endswith('/index')
+	assert views.admission.stats()['admitted'] == 0
+
+
+def test_release_on_error(views, client, monkeypatch):
+	def convert_docx():
+		raise RuntimeError('conversion failed')
+	monkeypatch.setattr(views, 'convert_docx', convert_docx)
+	with pytest.raises(RuntimeError):
+		upload(client)
+	assert views.admission.stats()['active'] == 0
+
+
+def test_admin_counters(views, client):
+	upload(client)
+	upload(client)
+	r = client.post('/admin_server', data={'username':views.app.config['USERNAME'], 'password':views.app.config['PASSWORD']})
+	assert b'Conversions: 1 admitted (0 queued), rejected 0 busy / 1 rate limited.' in r.data